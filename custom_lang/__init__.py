@@ -2,6 +2,9 @@ __all__ = [
     "lexer",
     "parser",
     "ast_nodes",
+    "resolver",
+    "compiler",
+    "py_codegen",
     "interpreter",
     "debugger",
     "cli",
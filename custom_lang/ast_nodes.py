@@ -1,105 +1,137 @@
 from __future__ import annotations
-from dataclasses import dataclass
+import operator
+from dataclasses import dataclass, field
 from typing import Any, List, Optional
 
 
+# Source positions stay inline as ``line``. With slots that is one pointer
+# per node, and the int it points at is shared by every token and node on
+# the same line. A per-node id into a packed side table would cost a fresh
+# int per node plus the table entry. The bytecode compiler keeps its own
+# packed line table (Code.lines).
+
 # Expressions
-@dataclass
+@dataclass(slots=True)
 class Expr:
     line: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Literal(Expr):
     value: Any
 
 
-@dataclass
+# depth/slot are filled in by the resolver; depth -1 means a global looked up by name
+@dataclass(slots=True)
 class Var(Expr):
     name: str
+    depth: int = -1
+    slot: int = -1
 
 
-@dataclass
+@dataclass(slots=True)
 class Unary(Expr):
     op: str
     right: Expr
 
 
-@dataclass
+@dataclass(slots=True)
 class Binary(Expr):
     left: Expr
     op: str
     right: Expr
 
 
-@dataclass
+# the Python operator behind each Binary.op; equality accepts any operands,
+# the rest need numbers (except '+', which also concatenates strings)
+BINARY_OPERATORS = {
+    "PLUS": operator.add,
+    "MINUS": operator.sub,
+    "STAR": operator.mul,
+    "SLASH": operator.truediv,
+    "PERCENT": operator.mod,
+    "GREATER": operator.gt,
+    "GREATER_EQUAL": operator.ge,
+    "LESS": operator.lt,
+    "LESS_EQUAL": operator.le,
+    "EQUAL_EQUAL": operator.eq,
+    "BANG_EQUAL": operator.ne,
+}
+EQUALITY_OPERATORS = frozenset(("EQUAL_EQUAL", "BANG_EQUAL"))
+
+
+@dataclass(slots=True)
 class Logical(Expr):
     left: Expr
     op: str
     right: Expr
 
 
-@dataclass
+@dataclass(slots=True)
 class Grouping(Expr):
     expr: Expr
 
 
 # Statements
-@dataclass
+@dataclass(slots=True)
 class Stmt:
     line: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Block(Stmt):
     statements: List[Stmt]
+    names: List[str] = field(default_factory=list)  # declared names in slot order
 
 
-@dataclass
+@dataclass(slots=True)
 class VarDecl(Stmt):
     name: str
     initializer: Optional[Expr]
+    slot: int = -1
 
 
-@dataclass
+@dataclass(slots=True)
 class Assign(Stmt):
     name: str
     value: Expr
+    depth: int = -1
+    slot: int = -1
 
 
-@dataclass
+@dataclass(slots=True)
 class ExprStmt(Stmt):
     expr: Expr
 
 
-@dataclass
+@dataclass(slots=True)
 class Print(Stmt):
     expr: Expr
 
 
-@dataclass
+@dataclass(slots=True)
 class If(Stmt):
     condition: Expr
     then_branch: Stmt
     else_branch: Optional[Stmt]
 
 
-@dataclass
+@dataclass(slots=True)
 class While(Stmt):
     condition: Expr
     body: Stmt
 
 
-@dataclass
+@dataclass(slots=True)
 class Break(Stmt):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class Continue(Stmt):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class Program:
     statements: List[Stmt]
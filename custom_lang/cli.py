@@ -2,11 +2,11 @@ from __future__ import annotations
 import argparse
 from .lexer import Lexer
 from .parser import Parser
-from .interpreter import Interpreter
+from .interpreter import ENGINES, Interpreter
 from .debugger import Debugger
 
 
-def run_file(path: str, debug: bool = False, breakpoints=None):
+def run_file(path: str, debug: bool = False, breakpoints=None, engine: str = "bytecode"):
     with open(path, "r", encoding="utf-8") as f:
         src = f.read()
     tokens = Lexer(src).lex()
@@ -14,7 +14,7 @@ def run_file(path: str, debug: bool = False, breakpoints=None):
     dbg = Debugger()
     if breakpoints:
         dbg.set_breakpoints(breakpoints)
-    interp = Interpreter()
+    interp = Interpreter(engine=engine)
     if debug:
         interp.run(program, debugger=dbg)
     else:
@@ -26,8 +26,9 @@ def main(argv=None):
     ap.add_argument("file", help="Source file to execute")
     ap.add_argument("--debug", action="store_true", help="Run with interactive debugger")
     ap.add_argument("--break", dest="breaks", nargs="*", help="Set breakpoints by line numbers")
+    ap.add_argument("--engine", choices=ENGINES, default="bytecode", help="Execution engine (ignored under --debug)")
     args = ap.parse_args(argv)
-    run_file(args.file, debug=args.debug, breakpoints=args.breaks)
+    run_file(args.file, debug=args.debug, breakpoints=args.breaks, engine=args.engine)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,374 @@
+from __future__ import annotations
+import math
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+from . import ast_nodes as A
+from .resolver import resolve
+
+
+# Opcodes. Instructions are laid out flat in ``Code.code``; each opcode is
+# followed by the number of operand words given in ``OPERAND_WORDS``.
+# with operand
+LOAD_CONST = 0
+LOAD_LOCAL = 1
+STORE_LOCAL = 2
+LOAD_GLOBAL = 3
+STORE_GLOBAL = 4
+DEFINE_GLOBAL = 5
+JUMP = 6
+JUMP_IF_FALSE = 7
+JUMP_IF_FALSE_OR_POP = 8
+JUMP_IF_TRUE_OR_POP = 9
+# superinstructions with two operands, only produced by the peephole pass
+INCR_LOCAL = 10  # slot, const: frame[slot] = frame[slot] + const
+INCR_GLOBAL = 11  # name, const
+COMPARE_JUMP_IF_FALSE = 12  # comparison opcode, target
+# without operand
+HALT = 13  # ends every Code object, so the VM needs no bounds check
+POP = 14
+PRINT = 15
+UNARY_NOT = 16
+UNARY_NEGATE = 17
+BINARY_ADD = 18
+BINARY_EQUAL = 19
+BINARY_NOT_EQUAL = 20
+# numeric binary ops (operands must be numbers) occupy the top of the range
+BINARY_SUB = 21
+BINARY_MUL = 22
+BINARY_DIV = 23
+BINARY_MOD = 24
+BINARY_GREATER = 25
+BINARY_GREATER_EQUAL = 26
+BINARY_LESS = 27
+BINARY_LESS_EQUAL = 28
+
+OPERAND_WORDS = {op: 1 for op in range(LOAD_CONST, JUMP_IF_TRUE_OR_POP + 1)}
+OPERAND_WORDS.update({INCR_LOCAL: 2, INCR_GLOBAL: 2, COMPARE_JUMP_IF_FALSE: 2})
+HAS_OPERAND = frozenset(OPERAND_WORDS)
+# jumps keep their target in the last operand word
+JUMPS = frozenset((JUMP, JUMP_IF_FALSE, JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP, COMPARE_JUMP_IF_FALSE))
+COMPARE_OPS = frozenset(
+    (BINARY_EQUAL, BINARY_NOT_EQUAL, BINARY_GREATER, BINARY_GREATER_EQUAL, BINARY_LESS, BINARY_LESS_EQUAL)
+)
+
+BINARY_OPS = {
+    "PLUS": BINARY_ADD,
+    "EQUAL_EQUAL": BINARY_EQUAL,
+    "BANG_EQUAL": BINARY_NOT_EQUAL,
+    "MINUS": BINARY_SUB,
+    "STAR": BINARY_MUL,
+    "SLASH": BINARY_DIV,
+    "PERCENT": BINARY_MOD,
+    "GREATER": BINARY_GREATER,
+    "GREATER_EQUAL": BINARY_GREATER_EQUAL,
+    "LESS": BINARY_LESS,
+    "LESS_EQUAL": BINARY_LESS_EQUAL,
+}
+
+# net change in stack depth per opcode
+STACK_EFFECT = {
+    LOAD_CONST: 1,
+    LOAD_LOCAL: 1,
+    STORE_LOCAL: -1,
+    LOAD_GLOBAL: 1,
+    STORE_GLOBAL: -1,
+    DEFINE_GLOBAL: -1,
+    JUMP: 0,
+    HALT: 0,
+    JUMP_IF_FALSE: -1,
+    # the or-pop jumps keep their operand on the taken branch only
+    JUMP_IF_FALSE_OR_POP: -1,
+    JUMP_IF_TRUE_OR_POP: -1,
+    POP: -1,
+    PRINT: -1,
+    UNARY_NOT: 0,
+    UNARY_NEGATE: 0,
+    INCR_LOCAL: 0,
+    INCR_GLOBAL: 0,
+    COMPARE_JUMP_IF_FALSE: -2,
+}
+for _op in BINARY_OPS.values():
+    STACK_EFFECT[_op] = -1
+del _op
+
+OPNAMES = {v: k for k, v in globals().items() if k.isupper() and isinstance(v, int) and not k.startswith("_")}
+
+
+# Hot instruction data stays in lists: indexing an array.array boxes a fresh
+# int on every read, which costs more in the dispatch loop than it saves.
+# Only data read off the hot path is packed into typed arrays.
+@dataclass
+class Code:
+    code: List[int]
+    consts: List[Any]
+    names: List[str]
+    lines: array  # array('I') of source lines per code word, parallel to ``code``
+    stack_size: int
+    nlocals: int  # block-scoped variables live in one flat frame of this size
+
+    def disassemble(self) -> str:
+        out = []
+        pc = 0
+        while pc < len(self.code):
+            op = self.code[pc]
+            text = f"{pc:4d} {OPNAMES[op]:<22}"
+            if op in HAS_OPERAND:
+                arg = self.code[pc + 1]
+                if op == LOAD_CONST:
+                    text += f"{arg} ({self.consts[arg]!r})"
+                elif op in (LOAD_GLOBAL, STORE_GLOBAL, DEFINE_GLOBAL, INCR_GLOBAL):
+                    text += f"{arg} ({self.names[arg]})"
+                elif op == COMPARE_JUMP_IF_FALSE:
+                    text += f"{arg} ({OPNAMES[arg]})"
+                else:
+                    text += str(arg)
+                if OPERAND_WORDS[op] == 2:
+                    arg = self.code[pc + 2]
+                    text += f", {arg}" + (f" ({self.consts[arg]!r})" if op != COMPARE_JUMP_IF_FALSE else "")
+            pc += 1 + OPERAND_WORDS.get(op, 0)
+            out.append(text.rstrip())
+        return "\n".join(out)
+
+
+@dataclass
+class _Loop:
+    start: int
+    breaks: List[int]
+
+
+class Compiler:
+    """Lowers an ``A.Program`` to a flat ``Code`` object in a single walk.
+
+    Block scopes are resolved away: each scoped block owns a window of the
+    frame starting where its parent's window ends, so sibling blocks share
+    frame indices and no scope objects exist at runtime.
+    """
+
+    def __init__(self):
+        self.code: List[int] = []
+        self.lines: List[int] = []
+        self.consts: List[Any] = []
+        self.names: List[str] = []
+        self._const_index: Dict[Tuple[Any, ...], int] = {}
+        self._name_index: Dict[str, int] = {}
+        self._loops: List[_Loop] = []
+        self._bases: List[int] = []  # frame offset of each enclosing scoped block
+        self._frame_end = 0
+        self._nlocals = 0
+        self._depth = 0
+        self._max_depth = 0
+
+    def compile(self, program: A.Program) -> Code:
+        resolve(program)
+        for stmt in program.statements:
+            self._stmt(stmt)
+        self._emit(HALT, self.lines[-1] if self.lines else 1)
+        code, lines = superinstructions(self.code, self.lines)
+        return Code(
+            code=code,
+            consts=self.consts,
+            names=self.names,
+            lines=array("I", lines),
+            stack_size=self._max_depth,
+            nlocals=self._nlocals,
+        )
+
+    # emission helpers
+    def _emit(self, op: int, line: int, arg: int = None) -> int:
+        pos = len(self.code)
+        self.code.append(op)
+        self.lines.append(line)
+        if op in HAS_OPERAND:
+            self.code.append(arg)
+            self.lines.append(line)
+        self._depth += STACK_EFFECT[op]
+        self._max_depth = max(self._max_depth, self._depth)
+        return pos
+
+    def _patch(self, pos: int, target: int = None):
+        self.code[pos + 1] = len(self.code) if target is None else target
+
+    def _const(self, value: Any) -> int:
+        key = (type(value), value)  # keep 1, 1.0 and True apart
+        if type(value) is float:
+            key += (math.copysign(1.0, value),)  # and 0.0 from -0.0
+        idx = self._const_index.get(key)
+        if idx is None:
+            idx = self._const_index[key] = len(self.consts)
+            self.consts.append(value)
+        return idx
+
+    def _name(self, name: str) -> int:
+        idx = self._name_index.get(name)
+        if idx is None:
+            idx = self._name_index[name] = len(self.names)
+            self.names.append(name)
+        return idx
+
+    def _local(self, depth: int, slot: int) -> int:
+        return self._bases[-1 - depth] + slot
+
+    # statements
+    def _stmt(self, stmt: A.Stmt):
+        line = stmt.line
+        if isinstance(stmt, A.Block):
+            if stmt.names:
+                self._bases.append(self._frame_end)
+                self._frame_end += len(stmt.names)
+                self._nlocals = max(self._nlocals, self._frame_end)
+            for s in stmt.statements:
+                self._stmt(s)
+            if stmt.names:
+                self._frame_end = self._bases.pop()
+        elif isinstance(stmt, A.VarDecl):
+            if stmt.initializer is not None:
+                self._expr(stmt.initializer)
+            else:
+                self._emit(LOAD_CONST, line, self._const(None))
+            if stmt.slot < 0:
+                self._emit(DEFINE_GLOBAL, line, self._name(stmt.name))
+            else:
+                self._emit(STORE_LOCAL, line, self._local(0, stmt.slot))
+        elif isinstance(stmt, A.Assign):
+            self._expr(stmt.value)
+            if stmt.depth < 0:
+                self._emit(STORE_GLOBAL, line, self._name(stmt.name))
+            else:
+                self._emit(STORE_LOCAL, line, self._local(stmt.depth, stmt.slot))
+        elif isinstance(stmt, A.ExprStmt):
+            self._expr(stmt.expr)
+            self._emit(POP, line)
+        elif isinstance(stmt, A.Print):
+            self._expr(stmt.expr)
+            self._emit(PRINT, line)
+        elif isinstance(stmt, A.If):
+            self._expr(stmt.condition)
+            to_else = self._emit(JUMP_IF_FALSE, line, 0)
+            self._stmt(stmt.then_branch)
+            if stmt.else_branch is not None:
+                to_end = self._emit(JUMP, line, 0)
+                self._patch(to_else)
+                self._stmt(stmt.else_branch)
+                self._patch(to_end)
+            else:
+                self._patch(to_else)
+        elif isinstance(stmt, A.While):
+            loop = _Loop(start=len(self.code), breaks=[])
+            self._expr(stmt.condition)
+            to_end = self._emit(JUMP_IF_FALSE, line, 0)
+            self._loops.append(loop)
+            self._stmt(stmt.body)
+            self._loops.pop()
+            self._emit(JUMP, line, loop.start)
+            self._patch(to_end)
+            for pos in loop.breaks:
+                self._patch(pos)
+        elif isinstance(stmt, A.Break):
+            loop = self._loops[-1]
+            loop.breaks.append(self._emit(JUMP, line, 0))
+        elif isinstance(stmt, A.Continue):
+            loop = self._loops[-1]
+            self._emit(JUMP, line, loop.start)
+        else:
+            raise RuntimeError(f"Unknown statement type: {type(stmt)}")
+
+    # expressions
+    def _expr(self, expr: A.Expr):
+        line = expr.line
+        if isinstance(expr, A.Literal):
+            self._emit(LOAD_CONST, line, self._const(expr.value))
+        elif isinstance(expr, A.Var):
+            if expr.depth < 0:
+                self._emit(LOAD_GLOBAL, line, self._name(expr.name))
+            else:
+                self._emit(LOAD_LOCAL, line, self._local(expr.depth, expr.slot))
+        elif isinstance(expr, A.Grouping):
+            self._expr(expr.expr)
+        elif isinstance(expr, A.Unary):
+            self._expr(expr.right)
+            if expr.op == "BANG":
+                self._emit(UNARY_NOT, line)
+            elif expr.op == "MINUS":
+                self._emit(UNARY_NEGATE, line)
+            else:
+                raise RuntimeError(f"Unknown unary op {expr.op}")
+        elif isinstance(expr, A.Binary):
+            op = BINARY_OPS.get(expr.op)
+            if op is None:
+                raise RuntimeError(f"Unknown binary op {expr.op}")
+            self._expr(expr.left)
+            self._expr(expr.right)
+            self._emit(op, line)
+        elif isinstance(expr, A.Logical):
+            self._expr(expr.left)
+            jump = JUMP_IF_TRUE_OR_POP if expr.op == "or" else JUMP_IF_FALSE_OR_POP
+            to_end = self._emit(jump, line, 0)
+            self._expr(expr.right)
+            self._patch(to_end)
+        else:
+            raise RuntimeError(f"Unknown expression type: {type(expr)}")
+
+
+def _fuse(instrs: List[Tuple[int, List[int]]], i: int, targets: Set[int]) -> Optional[Tuple[List[int], int, int]]:
+    """Matches a fusable window at ``instrs[i]``.
+
+    Returns the fused instruction words, how many instructions they replace
+    and the position whose line the fused instruction reports errors at.
+    """
+    window = instrs[i:i + 4]
+    ops = [words[0] for _, words in window]
+    if ops in ([LOAD_LOCAL, LOAD_CONST, BINARY_ADD, STORE_LOCAL], [LOAD_GLOBAL, LOAD_CONST, BINARY_ADD, STORE_GLOBAL]):
+        load, const, _, store = (words for _, words in window)
+        if load[1] == store[1] and not any(pos in targets for pos, _ in window[1:]):
+            op = INCR_LOCAL if load[0] == LOAD_LOCAL else INCR_GLOBAL
+            return [op, load[1], const[1]], 4, window[2][0]
+    if ops[0] in COMPARE_OPS and ops[1:2] == [JUMP_IF_FALSE] and window[1][0] not in targets:
+        return [COMPARE_JUMP_IF_FALSE, ops[0], window[1][1][1]], 2, window[0][0]
+    return None
+
+
+def superinstructions(code: List[int], lines: List[int]) -> Tuple[List[int], List[int]]:
+    """Peephole pass fusing common short sequences into single instructions.
+
+    ``x = x + c`` becomes one INCR_LOCAL/INCR_GLOBAL and a comparison feeding
+    a conditional jump becomes one COMPARE_JUMP_IF_FALSE, which for a typical
+    counting loop halves the instructions dispatched per iteration. A window
+    is left alone when a jump lands inside it; jump targets are remapped to
+    the new positions afterwards.
+    """
+    instrs: List[Tuple[int, List[int]]] = []
+    pc = 0
+    while pc < len(code):
+        width = 1 + OPERAND_WORDS.get(code[pc], 0)
+        instrs.append((pc, code[pc:pc + width]))
+        pc += width
+    targets = {words[-1] for _, words in instrs if words[0] in JUMPS}
+    out: List[int] = []
+    out_lines: List[int] = []
+    moved: Dict[int, int] = {}  # old position -> new position
+    jump_words: List[int] = []  # positions in ``out`` holding an old jump target
+    i = 0
+    while i < len(instrs):
+        pos, words = instrs[i]
+        moved[pos] = len(out)
+        fused = _fuse(instrs, i, targets)
+        if fused is None:
+            line = lines[pos]
+            i += 1
+        else:
+            words, count, line_pos = fused
+            line = lines[line_pos]
+            i += count
+        if words[0] in JUMPS:
+            jump_words.append(len(out) + len(words) - 1)
+        out.extend(words)
+        out_lines.extend([line] * len(words))
+    moved[len(code)] = len(out)
+    for at in jump_words:
+        out[at] = moved[out[at]]
+    return out, out_lines
+
+
+def compile_program(program: A.Program) -> Code:
+    return Compiler().compile(program)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Dict, Set
+from typing import Callable, Dict, Set, Union
 
 
 @dataclass
@@ -15,9 +15,10 @@ class Debugger:
             except ValueError:
                 pass
 
-    def check_pause(self, line: int, variables: Dict[str, object], depth: int = 0):
+    def check_pause(self, line: int, variables: Union[Dict[str, object], Callable[[], Dict[str, object]]], depth: int = 0):
         if self.stepping or line in self.breakpoints:
-            self._repl(line, variables)
+            # variables may be passed lazily so callers only build them on a pause
+            self._repl(line, variables() if callable(variables) else variables)
 
     # very simple console REPL
     def _repl(self, line: int, variables: Dict[str, object]):
@@ -1,180 +1,536 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from . import ast_nodes as A
+from .resolver import resolve
+from . import py_codegen as P
+from . import compiler as C
+from .compiler import Code, compile_program
 
 
-class BreakSignal(Exception):
-    pass
+# exact types accepted by numeric operators (bool is an int subclass)
+NUMBER_TYPES = frozenset((int, float, bool))
+
+
+# value helpers live at module level: a global load is cheaper than self.<attr>
+def _is_truthy(value: Any) -> bool:
+    if value is None:
+        return False
+    return bool(value)
+
+
+def _add(left: Any, right: Any, line: int) -> Any:
+    if isinstance(left, (int, float)) and isinstance(right, (int, float)):
+        return left + right
+    if isinstance(left, str) or isinstance(right, str):
+        return str(left) + str(right)
+    raise TypeError(f"Operands to '+' must be numbers or strings at line {line}")
+
+
+def _num(value: Any, line: int) -> float:
+    if not isinstance(value, (int, float)):
+        raise TypeError(f"Operand must be a number at line {line}")
+    return value
+
 
+# C-level operators applied directly once both operands are known numbers
+_NUMBER_OPS = A.BINARY_OPERATORS
 
-class ContinueSignal(Exception):
+
+def _numeric(fn):
+    def apply(left: Any, right: Any, line: int) -> Any:
+        if left.__class__ in NUMBER_TYPES and right.__class__ in NUMBER_TYPES:
+            return fn(left, right)
+        raise TypeError(f"Operand must be a number at line {line}")
+    return apply
+
+
+def _untyped(fn):
+    def apply(left: Any, right: Any, line: int) -> Any:
+        return fn(left, right)
+    return apply
+
+
+def _noop(stmt: A.Stmt):
     pass
 
 
-@dataclass
-class Environment:
-    values: Dict[str, Any]
-    enclosing: Optional["Environment"] = None
+def _undefined(name: str):
+    raise NameError(f"Undefined variable '{name}'.")
 
-    def define(self, name: str, value: Any):
-        self.values[name] = value
 
-    def assign(self, name: str, value: Any):
-        if name in self.values:
-            self.values[name] = value
-            return
-        if self.enclosing is not None:
-            self.enclosing.assign(name, value)
-            return
-        raise NameError(f"Undefined variable '{name}'.")
+# loop control state set by break/continue and consumed by the enclosing while
+_NORMAL = 0
+_BREAK = 1
+_CONTINUE = 2
+
+
+# marks a block slot whose declaration has not run yet
+_UNSET = object()
+
+
+@dataclass(slots=True)
+class Environment:
+    # a block scope: values are indexed by resolved slot
+    values: List[Any]
+    enclosing: Optional["Environment"] = None
 
-    def get(self, name: str) -> Any:
-        if name in self.values:
-            return self.values[name]
-        if self.enclosing is not None:
-            return self.enclosing.get(name)
-        raise NameError(f"Undefined variable '{name}'.")
 
-    def snapshot(self) -> Dict[str, Any]:
-        data = {}
-        if self.enclosing is not None:
-            data.update(self.enclosing.snapshot())
-        data.update(self.values)
-        return data
+ENGINES = ("bytecode", "python", "tree")
 
 
 class Interpreter:
-    def __init__(self, output=print):
-        self.globals = Environment(values={})
-        self.env = self.globals
+    def __init__(self, output=print, engine: str = "bytecode"):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}; expected one of {', '.join(ENGINES)}")
+        self.engine = engine
+        self.globals: Dict[str, Any] = {}
+        self.env: Optional[Environment] = None  # innermost block scope
+        # globals are the only name-keyed scope; bind their lookup once
+        self._global_get = self.globals.get
         self.output = output
         self._call_depth = 0  # reserved for future function support
         self.debugger = None
+        self._loop_state = _NORMAL
+        self._maybe_debug = _noop
+        # debugger view of the visible bindings, kept up to date as scopes change
+        self._flat_vars: Optional[Dict[str, Any]] = None
+        self._shadow_stack: List[List[Tuple[str, Any]]] = []
+        # bumped whenever _flat_vars changes; snapshots are reused until then
+        self._env_version = 0
+        self._snap_version = -1
+        self._snap: Optional[Dict[str, Any]] = None
+        # tree-walker dispatch tables, keyed by exact node class. A match
+        # statement over the node classes measured slower here: MATCH_CLASS
+        # tests the cases one after another and does isinstance checks, while
+        # this is a single hash lookup on type(node).
+        self._stmt_dispatch = {
+            A.Block: self._execute_block,
+            A.VarDecl: self._exec_var_decl,
+            A.Assign: self._exec_assign,
+            A.ExprStmt: self._exec_expr_stmt,
+            A.Print: self._exec_print,
+            A.If: self._exec_if,
+            A.While: self._exec_while,
+            A.Break: self._exec_break,
+            A.Continue: self._exec_continue,
+        }
+        self._expr_dispatch = {
+            A.Literal: self._eval_literal,
+            A.Var: self._eval_var,
+            A.Grouping: self._eval_grouping,
+            A.Unary: self._eval_unary,
+            A.Binary: self._eval_binary,
+            A.Logical: self._eval_logical,
+        }
+        # binary operators take (left, right, line) and check their operands
+        self._binops = {
+            op: _untyped(fn) if op in A.EQUALITY_OPERATORS else _numeric(fn)
+            for op, fn in A.BINARY_OPERATORS.items()
+        }
+        self._binops["PLUS"] = _add
 
     def run(self, program: A.Program, debugger=None):
         self.debugger = debugger
+        # bound once per run so undebugged tree walks pay no per-statement check
+        self._maybe_debug = _noop if debugger is None else self._debug_check
+        if debugger is None and self.engine == "bytecode":
+            self._run_code(compile_program(program))
+            return
+        if debugger is None and self.engine == "python":
+            self._run_python(program)
+            return
+        # the debugger needs per-statement pauses, so walk the tree instead
+        resolve(program)
+        if debugger is not None:
+            self._flat_vars = dict(self.globals)
+            self._shadow_stack = []
+            self._env_version += 1
+        else:
+            self._flat_vars = None
         for stmt in program.statements:
             self._maybe_debug(stmt)
             self._execute(stmt)
 
+    # Python codegen: run the program as a CPython function
+    def _run_python(self, program: A.Program):
+        gvals = self.globals
+        try:
+            code = P.compile_python(program, gvals)
+        except (SyntaxError, RecursionError):
+            # CPython rejects more than 20 nested loops/ifs, which the VM
+            # runs fine. Errors every engine hits (a stray 'break', or an
+            # expression deep enough to exhaust the recursion limit in the
+            # resolver and compilers) are raised again by compile_program.
+            self._run_code(compile_program(program))
+            return
+        ns = {P.global_name(k): v for k, v in gvals.items()}
+        ns.update({
+            "__builtins__": {},
+            P.PRINT: self.output,
+            P.NUM: _num,
+            P.UNDEFINED: _undefined,
+        })
+        ns.update({P.BINOP_PREFIX + op: fn for op, fn in self._binops.items()})
+        exec(code, ns)
+        try:
+            ns[P.PROGRAM]()
+        finally:
+            prefix = P.GLOBAL_PREFIX
+            for k, v in ns.items():
+                if k.startswith(prefix):
+                    gvals[k[len(prefix):]] = v
+
+    # Bytecode dispatch loop
+    def _run_code(self, code: Code):
+        # Opcodes are bound to locals so each test in the ladder below is a
+        # fast local load rather than a module global lookup. Branches are
+        # ordered by how often the op runs in typical loops.
+        LOAD_CONST, LOAD_LOCAL, STORE_LOCAL = C.LOAD_CONST, C.LOAD_LOCAL, C.STORE_LOCAL
+        LOAD_GLOBAL, STORE_GLOBAL, DEFINE_GLOBAL = C.LOAD_GLOBAL, C.STORE_GLOBAL, C.DEFINE_GLOBAL
+        JUMP, JUMP_IF_FALSE = C.JUMP, C.JUMP_IF_FALSE
+        JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP = C.JUMP_IF_FALSE_OR_POP, C.JUMP_IF_TRUE_OR_POP
+        INCR_LOCAL, INCR_GLOBAL, COMPARE_JUMP_IF_FALSE = C.INCR_LOCAL, C.INCR_GLOBAL, C.COMPARE_JUMP_IF_FALSE
+        HALT, POP, PRINT, UNARY_NOT, UNARY_NEGATE = C.HALT, C.POP, C.PRINT, C.UNARY_NOT, C.UNARY_NEGATE
+        BINARY_ADD, BINARY_EQUAL, BINARY_NOT_EQUAL = C.BINARY_ADD, C.BINARY_EQUAL, C.BINARY_NOT_EQUAL
+        BINARY_SUB, BINARY_MUL, BINARY_DIV, BINARY_MOD = C.BINARY_SUB, C.BINARY_MUL, C.BINARY_DIV, C.BINARY_MOD
+        BINARY_GREATER, BINARY_GREATER_EQUAL = C.BINARY_GREATER, C.BINARY_GREATER_EQUAL
+        BINARY_LESS, BINARY_LESS_EQUAL = C.BINARY_LESS, C.BINARY_LESS_EQUAL
+        numbers = NUMBER_TYPES
+        instrs = code.code
+        consts = code.consts
+        names = code.names
+        lines = code.lines
+        stack = [None] * code.stack_size
+        frame = [None] * code.nlocals
+        sp = 0
+        pc = 0
+        gvals = self.globals
+        output = self.output
+        num = _num
+        add = _add
+        while True:
+            op = instrs[pc]
+            pc += 1
+            if op == LOAD_LOCAL:
+                stack[sp] = frame[instrs[pc]]
+                sp += 1
+                pc += 1
+            elif op == LOAD_GLOBAL:
+                try:
+                    stack[sp] = gvals[names[instrs[pc]]]
+                except KeyError:
+                    raise NameError(f"Undefined variable '{names[instrs[pc]]}'.") from None
+                sp += 1
+                pc += 1
+            elif op == LOAD_CONST:
+                stack[sp] = consts[instrs[pc]]
+                sp += 1
+                pc += 1
+            elif op == STORE_LOCAL:
+                sp -= 1
+                frame[instrs[pc]] = stack[sp]
+                pc += 1
+            elif op == STORE_GLOBAL:
+                name = names[instrs[pc]]
+                if name not in gvals:
+                    raise NameError(f"Undefined variable '{name}'.")
+                sp -= 1
+                gvals[name] = stack[sp]
+                pc += 1
+            elif op >= BINARY_SUB:
+                sp -= 1
+                left = stack[sp - 1]
+                right = stack[sp]
+                if left.__class__ not in numbers or right.__class__ not in numbers:
+                    num(left, lines[pc - 1])
+                    num(right, lines[pc - 1])
+                if op == BINARY_LESS:
+                    stack[sp - 1] = left < right
+                elif op == BINARY_SUB:
+                    stack[sp - 1] = left - right
+                elif op == BINARY_MUL:
+                    stack[sp - 1] = left * right
+                elif op == BINARY_MOD:
+                    stack[sp - 1] = left % right
+                elif op == BINARY_GREATER:
+                    stack[sp - 1] = left > right
+                elif op == BINARY_DIV:
+                    stack[sp - 1] = left / right
+                elif op == BINARY_GREATER_EQUAL:
+                    stack[sp - 1] = left >= right
+                else:
+                    stack[sp - 1] = left <= right
+            elif op == BINARY_ADD:
+                sp -= 1
+                left = stack[sp - 1]
+                right = stack[sp]
+                if left.__class__ in numbers and right.__class__ in numbers:
+                    stack[sp - 1] = left + right
+                else:
+                    stack[sp - 1] = add(left, right, lines[pc - 1])
+            elif op == COMPARE_JUMP_IF_FALSE:
+                sp -= 2
+                left = stack[sp]
+                right = stack[sp + 1]
+                cmp = instrs[pc]
+                if cmp == BINARY_EQUAL:
+                    result = left == right
+                elif cmp == BINARY_NOT_EQUAL:
+                    result = left != right
+                else:
+                    if left.__class__ not in numbers or right.__class__ not in numbers:
+                        num(left, lines[pc - 1])
+                        num(right, lines[pc - 1])
+                    if cmp == BINARY_LESS:
+                        result = left < right
+                    elif cmp == BINARY_GREATER:
+                        result = left > right
+                    elif cmp == BINARY_LESS_EQUAL:
+                        result = left <= right
+                    else:
+                        result = left >= right
+                pc = pc + 2 if result else instrs[pc + 1]
+            elif op == INCR_LOCAL:
+                slot = instrs[pc]
+                left = frame[slot]
+                right = consts[instrs[pc + 1]]
+                if left.__class__ in numbers and right.__class__ in numbers:
+                    frame[slot] = left + right
+                else:
+                    frame[slot] = add(left, right, lines[pc - 1])
+                pc += 2
+            elif op == INCR_GLOBAL:
+                name = names[instrs[pc]]
+                try:
+                    left = gvals[name]
+                except KeyError:
+                    raise NameError(f"Undefined variable '{name}'.") from None
+                right = consts[instrs[pc + 1]]
+                if left.__class__ in numbers and right.__class__ in numbers:
+                    gvals[name] = left + right
+                else:
+                    gvals[name] = add(left, right, lines[pc - 1])
+                pc += 2
+            elif op == JUMP:
+                pc = instrs[pc]
+            elif op == JUMP_IF_FALSE:
+                sp -= 1
+                if stack[sp]:
+                    pc += 1
+                else:
+                    pc = instrs[pc]
+            elif op == JUMP_IF_FALSE_OR_POP:
+                if stack[sp - 1]:
+                    sp -= 1
+                    pc += 1
+                else:
+                    pc = instrs[pc]
+            elif op == JUMP_IF_TRUE_OR_POP:
+                if stack[sp - 1]:
+                    pc = instrs[pc]
+                else:
+                    sp -= 1
+                    pc += 1
+            elif op == BINARY_EQUAL:
+                sp -= 1
+                stack[sp - 1] = stack[sp - 1] == stack[sp]
+            elif op == BINARY_NOT_EQUAL:
+                sp -= 1
+                stack[sp - 1] = stack[sp - 1] != stack[sp]
+            elif op == UNARY_NOT:
+                stack[sp - 1] = not stack[sp - 1]
+            elif op == UNARY_NEGATE:
+                stack[sp - 1] = -num(stack[sp - 1], lines[pc - 1])
+            elif op == POP:
+                sp -= 1
+            elif op == PRINT:
+                sp -= 1
+                output(stack[sp])
+            elif op == DEFINE_GLOBAL:
+                sp -= 1
+                gvals[names[instrs[pc]]] = stack[sp]
+                pc += 1
+            elif op == HALT:
+                return
+            else:
+                raise RuntimeError(f"Unknown opcode {op}")
+
     # Debug hook
-    def _maybe_debug(self, stmt: A.Stmt):
-        if self.debugger is not None:
-            self.debugger.check_pause(stmt.line, self.env.snapshot(), depth=self._call_depth)
+    def _debug_check(self, stmt: A.Stmt):
+        d = self.debugger
+        if not d.stepping and stmt.line not in d.breakpoints:
+            return
+        d.check_pause(stmt.line, self._snapshot, depth=self._call_depth)
+
+    def _snapshot(self) -> Dict[str, Any]:
+        if self._snap_version != self._env_version:
+            self._snap = dict(self._flat_vars)
+            self._snap_version = self._env_version
+        return self._snap
 
     # Statement execution
     def _execute(self, stmt: A.Stmt):
-        if isinstance(stmt, A.Block):
-            self._execute_block(stmt)
-        elif isinstance(stmt, A.VarDecl):
-            val = self._evaluate(stmt.initializer) if stmt.initializer is not None else None
-            self.env.define(stmt.name, val)
-        elif isinstance(stmt, A.Assign):
-            val = self._evaluate(stmt.value)
-            self.env.assign(stmt.name, val)
-        elif isinstance(stmt, A.ExprStmt):
-            self._evaluate(stmt.expr)
-        elif isinstance(stmt, A.Print):
-            val = self._evaluate(stmt.expr)
-            self.output(val)
-        elif isinstance(stmt, A.If):
-            if self._is_truthy(self._evaluate(stmt.condition)):
-                self._execute(stmt.then_branch)
-            elif stmt.else_branch is not None:
-                self._execute(stmt.else_branch)
-        elif isinstance(stmt, A.While):
-            while self._is_truthy(self._evaluate(stmt.condition)):
-                try:
-                    self._maybe_debug(stmt)
-                    self._execute(stmt.body)
-                except BreakSignal:
-                    break
-                except ContinueSignal:
-                    continue
-        elif isinstance(stmt, A.Break):
-            raise BreakSignal()
-        elif isinstance(stmt, A.Continue):
-            raise ContinueSignal()
+        try:
+            handler = self._stmt_dispatch[type(stmt)]
+        except KeyError:
+            raise RuntimeError(f"Unknown statement type: {type(stmt)}") from None
+        handler(stmt)
+
+    def _exec_var_decl(self, stmt: A.VarDecl):
+        val = self._evaluate(stmt.initializer) if stmt.initializer is not None else None
+        if stmt.slot < 0:
+            self.globals[stmt.name] = val
+        else:
+            self.env.values[stmt.slot] = val
+        flat = self._flat_vars
+        if flat is not None:
+            if self._shadow_stack:
+                self._shadow_stack[-1].append((stmt.name, flat.get(stmt.name, _UNSET)))
+            flat[stmt.name] = val
+            self._env_version += 1
+
+    def _exec_assign(self, stmt: A.Assign):
+        val = self._evaluate(stmt.value)
+        if stmt.depth < 0:
+            gvals = self.globals
+            if stmt.name not in gvals:
+                raise NameError(f"Undefined variable '{stmt.name}'.")
+            gvals[stmt.name] = val
+        elif stmt.depth == 0:
+            self.env.values[stmt.slot] = val
         else:
-            raise RuntimeError(f"Unknown statement type: {type(stmt)}")
+            env = self.env
+            depth = stmt.depth
+            while depth:
+                env = env.enclosing
+                depth -= 1
+            env.values[stmt.slot] = val
+        if self._flat_vars is not None:
+            # resolution mirrors visibility, so the target is the visible binding
+            self._flat_vars[stmt.name] = val
+            self._env_version += 1
+
+    def _exec_expr_stmt(self, stmt: A.ExprStmt):
+        self._evaluate(stmt.expr)
+
+    def _exec_print(self, stmt: A.Print):
+        self.output(self._evaluate(stmt.expr))
+
+    def _exec_if(self, stmt: A.If):
+        if _is_truthy(self._evaluate(stmt.condition)):
+            self._execute(stmt.then_branch)
+        elif stmt.else_branch is not None:
+            self._execute(stmt.else_branch)
+
+    def _exec_while(self, stmt: A.While):
+        evaluate = self._evaluate
+        execute = self._execute
+        maybe_debug = self._maybe_debug
+        condition = stmt.condition
+        body = stmt.body
+        while _is_truthy(evaluate(condition)):
+            maybe_debug(stmt)
+            execute(body)
+            if self._loop_state:
+                state = self._loop_state
+                self._loop_state = _NORMAL
+                if state == _BREAK:
+                    break
+
+    def _exec_break(self, stmt: A.Break):
+        self._loop_state = _BREAK
+
+    def _exec_continue(self, stmt: A.Continue):
+        self._loop_state = _CONTINUE
 
     def _execute_block(self, block: A.Block):
         previous = self.env
+        tracking = self._flat_vars is not None and block.names
         try:
-            self.env = Environment(values={}, enclosing=previous)
+            if block.names:
+                self.env = Environment(values=[_UNSET] * len(block.names), enclosing=previous)
+            if tracking:
+                self._shadow_stack.append([])
+            execute = self._execute
+            maybe_debug = self._maybe_debug
             for s in block.statements:
-                self._maybe_debug(s)
-                self._execute(s)
+                maybe_debug(s)
+                execute(s)
+                if self._loop_state:
+                    return
         finally:
             self.env = previous
+            if tracking:
+                self._unshadow(self._shadow_stack.pop())
+
+    def _unshadow(self, shadowed):
+        if not shadowed:
+            return
+        self._env_version += 1
+        flat = self._flat_vars
+        for name, prev in reversed(shadowed):
+            if prev is _UNSET:
+                del flat[name]
+            else:
+                flat[name] = prev
 
     # Expression evaluation
     def _evaluate(self, expr: A.Expr):
-        if isinstance(expr, A.Literal):
-            return expr.value
-        if isinstance(expr, A.Var):
-            return self.env.get(expr.name)
-        if isinstance(expr, A.Grouping):
-            return self._evaluate(expr.expr)
-        if isinstance(expr, A.Unary):
-            right = self._evaluate(expr.right)
-            if expr.op == "BANG":
-                return not self._is_truthy(right)
-            if expr.op == "MINUS":
-                return -self._num(right, expr.line)
-            raise RuntimeError(f"Unknown unary op {expr.op}")
-        if isinstance(expr, A.Binary):
-            left = self._evaluate(expr.left)
-            right = self._evaluate(expr.right)
-            t = expr.op
-            if t == "PLUS":
-                if isinstance(left, (int, float)) and isinstance(right, (int, float)):
-                    return left + right
-                if isinstance(left, str) or isinstance(right, str):
-                    return str(left) + str(right)
-                raise TypeError(f"Operands to '+' must be numbers or strings at line {expr.line}")
-            if t == "MINUS":
-                return self._num(left, expr.line) - self._num(right, expr.line)
-            if t == "STAR":
-                return self._num(left, expr.line) * self._num(right, expr.line)
-            if t == "SLASH":
-                return self._num(left, expr.line) / self._num(right, expr.line)
-            if t == "PERCENT":
-                return self._num(left, expr.line) % self._num(right, expr.line)
-            if t == "GREATER":
-                return self._num(left, expr.line) > self._num(right, expr.line)
-            if t == "GREATER_EQUAL":
-                return self._num(left, expr.line) >= self._num(right, expr.line)
-            if t == "LESS":
-                return self._num(left, expr.line) < self._num(right, expr.line)
-            if t == "LESS_EQUAL":
-                return self._num(left, expr.line) <= self._num(right, expr.line)
-            if t == "EQUAL_EQUAL":
-                return left == right
-            if t == "BANG_EQUAL":
-                return left != right
-            raise RuntimeError(f"Unknown binary op {t}")
-        if isinstance(expr, A.Logical):
-            left = self._evaluate(expr.left)
-            if expr.op == "or":
-                if self._is_truthy(left):
-                    return left
-            else:  # and
-                if not self._is_truthy(left):
-                    return left
-            return self._evaluate(expr.right)
-        raise RuntimeError(f"Unknown expression type: {type(expr)}")
-
-    # helpers
-    @staticmethod
-    def _is_truthy(value: Any) -> bool:
-        if value is None:
-            return False
-        return bool(value)
-
-    @staticmethod
-    def _num(value: Any, line: int) -> float:
-        if not isinstance(value, (int, float)):
-            raise TypeError(f"Operand must be a number at line {line}")
-        return value
+        try:
+            handler = self._expr_dispatch[type(expr)]
+        except KeyError:
+            raise RuntimeError(f"Unknown expression type: {type(expr)}") from None
+        return handler(expr)
+
+    def _eval_literal(self, expr: A.Literal):
+        return expr.value
+
+    def _eval_var(self, expr: A.Var):
+        if expr.depth < 0:
+            value = self._global_get(expr.name, _UNSET)
+            if value is _UNSET:
+                raise NameError(f"Undefined variable '{expr.name}'.")
+            return value
+        if expr.depth == 0:
+            return self.env.values[expr.slot]
+        env = self.env
+        depth = expr.depth
+        while depth:
+            env = env.enclosing
+            depth -= 1
+        return env.values[expr.slot]
+
+    def _eval_grouping(self, expr: A.Grouping):
+        return self._evaluate(expr.expr)
+
+    def _eval_unary(self, expr: A.Unary):
+        right = self._evaluate(expr.right)
+        if expr.op == "BANG":
+            return not _is_truthy(right)
+        if expr.op == "MINUS":
+            return -_num(right, expr.line)
+        raise RuntimeError(f"Unknown unary op {expr.op}")
+
+    def _eval_binary(self, expr: A.Binary):
+        left = self._evaluate(expr.left)
+        right = self._evaluate(expr.right)
+        if left.__class__ in NUMBER_TYPES and right.__class__ in NUMBER_TYPES:
+            fast = _NUMBER_OPS.get(expr.op)
+            if fast is not None:
+                return fast(left, right)
+        try:
+            op = self._binops[expr.op]
+        except KeyError:
+            raise RuntimeError(f"Unknown binary op {expr.op}") from None
+        return op(left, right, expr.line)
+
+    def _eval_logical(self, expr: A.Logical):
+        left = self._evaluate(expr.left)
+        if expr.op == "or":
+            if _is_truthy(left):
+                return left
+        else:  # and
+            if not _is_truthy(left):
+                return left
+        return self._evaluate(expr.right)
@@ -1,4 +1,6 @@
 from __future__ import annotations
+import re
+import sys
 from dataclasses import dataclass
 from typing import List, Optional
 
@@ -19,7 +21,7 @@ KEYWORDS = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class Token:
     type: str
     lexeme: str
@@ -32,182 +34,138 @@ class Token:
         return f"Token({self.type},{self.lexeme!r}{lit},@{self.line}:{self.column})"
 
 
+# One alternative per token class, tried left to right at each position.
+# Names scan their ASCII run with explicit character sets, which sre tests
+# with a bitmap lookup, and only then fall back to the Unicode \w category,
+# so non-ASCII names still lex as before.
+TOKEN_RE = re.compile(
+    r"""
+    (?P<WS>[ \t\r\n]+)
+  | (?P<LINE_COMMENT>//[^\n]*)
+  | (?P<BLOCK_COMMENT>/\*)
+  | (?P<NUMBER>\d+(?:\.\d+)?)
+  | (?P<IDENTIFIER>(?:[A-Za-z_][A-Za-z0-9_]*|[^\W\d])\w*)
+  | (?P<STRING>"(?:\\.|[^"\\])*")
+  | (?P<OP>[!=<>]=?|[-+*/%(){},;])
+  | (?P<ERROR>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+COMMENT_DELIM_RE = re.compile(r"/\*|\*/")
+ESCAPE_RE = re.compile(r"\\(.)", re.DOTALL)
+ESCAPES = {"n": "\n", "t": "\t", "r": "\r", '"': '"', "\\": "\\"}
+
+OPERATORS = {
+    "(": "LEFT_PAREN",
+    ")": "RIGHT_PAREN",
+    "{": "LEFT_BRACE",
+    "}": "RIGHT_BRACE",
+    ",": "COMMA",
+    ";": "SEMICOLON",
+    "!": "BANG",
+    "!=": "BANG_EQUAL",
+    "=": "EQUAL",
+    "==": "EQUAL_EQUAL",
+    "<": "LESS",
+    "<=": "LESS_EQUAL",
+    ">": "GREATER",
+    ">=": "GREATER_EQUAL",
+    "+": "PLUS",
+    "-": "MINUS",
+    "*": "STAR",
+    "/": "SLASH",
+    "%": "PERCENT",
+}
+
+KEYWORD_LITERALS = {"TRUE": True, "FALSE": False}
+
+
+def _unescape(m: re.Match) -> str:
+    ch = m.group(1)
+    return ESCAPES.get(ch, ch)
+
+
 class Lexer:
     def __init__(self, source: str):
         self.source = source
-        self.start = 0
-        self.current = 0
         self.line = 1
-        self.col = 1
+        self.line_start = 0  # offset of the first character on the current line
         self.tokens: List[Token] = []
 
     def lex(self) -> List[Token]:
-        while not self._is_at_end():
-            self.start = self.current
-            self._scan_token()
-        self.tokens.append(Token("EOF", "", None, self.line, self.col))
-        return self.tokens
+        source = self.source
+        tokens = self.tokens
+        append = tokens.append
+        match = TOKEN_RE.match
+        line = self.line
+        line_start = self.line_start
+        pos = 0
+        end = len(source)
+        while pos < end:
+            m = match(source, pos)
+            kind = m.lastgroup
+            text = m.group()
+            start = pos
+            pos = m.end()
+            if kind == "WS":
+                if "\n" in text:
+                    line += text.count("\n")
+                    line_start = start + text.rindex("\n") + 1
+            elif kind == "OP":
+                append(Token(OPERATORS[text], text, None, line, start - line_start + 1))
+            elif kind == "IDENTIFIER":
+                if not text.isascii() and not (text[0].isalpha() or text[0] == "_"):
+                    raise SyntaxError(f"Unexpected character {text[0]!r} at line {line}")
+                type_ = KEYWORDS.get(text)
+                if type_ is None:
+                    # names end up as scope keys; interned, they compare by identity
+                    append(Token("IDENTIFIER", sys.intern(text), None, line, start - line_start + 1))
+                else:
+                    append(Token(type_, text, KEYWORD_LITERALS.get(type_), line, start - line_start + 1))
+            elif kind == "NUMBER":
+                num = float(text)
+                if num.is_integer():
+                    num = int(num)
+                append(Token("NUMBER", text, num, line, start - line_start + 1))
+            elif kind == "STRING":
+                value = text[1:-1]
+                if "\\" in value:
+                    value = ESCAPE_RE.sub(_unescape, value)
+                if "\n" in text:
+                    # multi-line strings report the line they end on, at column 1
+                    line += text.count("\n")
+                    line_start = start + text.rindex("\n") + 1
+                    append(Token("STRING", text, value, line, 1))
+                else:
+                    append(Token("STRING", text, value, line, start - line_start + 1))
+            elif kind == "LINE_COMMENT":
+                pass
+            elif kind == "BLOCK_COMMENT":
+                self.line, self.line_start = line, line_start
+                pos = self._block_comment(pos)
+                line, line_start = self.line, self.line_start
+            elif text == "\"":
+                raise SyntaxError(f"Unterminated string starting at line {line}")
+            else:
+                raise SyntaxError(f"Unexpected character {text!r} at line {line}")
+        self.line, self.line_start = line, line_start
+        append(Token("EOF", "", None, line, end - line_start + 1))
+        return tokens
 
     # internals
-    def _is_at_end(self) -> bool:
-        return self.current >= len(self.source)
-
-    def _advance(self) -> str:
-        ch = self.source[self.current]
-        self.current += 1
-        if ch == "\n":
-            self.line += 1
-            self.col = 1
-        else:
-            self.col += 1
-        return ch
-
-    def _peek(self) -> str:
-        if self._is_at_end():
-            return "\0"
-        return self.source[self.current]
-
-    def _peek_next(self) -> str:
-        if self.current + 1 >= len(self.source):
-            return "\0"
-        return self.source[self.current + 1]
-
-    def _match(self, expected: str) -> bool:
-        if self._is_at_end() or self.source[self.current] != expected:
-            return False
-        # update col as if consumed
-        self.current += 1
-        self.col += 1 if expected != "\n" else 0
-        return True
-
-    def _add(self, type_: str, literal: Optional[object] = None):
-        text = self.source[self.start:self.current]
-        # find starting column from current col minus length for single-line tokens
-        # For multi-line strings, we tracked columns line-by-line via _advance.
-        start_col = self.col - (len(text) if "\n" not in text else len(text.split("\n")[-1]))
-        self.tokens.append(Token(type_, text, literal, self.line, max(1, start_col)))
-
-    def _scan_token(self):
-        c = self._advance()
-        if c in (" ", "\r", "\t"):
-            return
-        if c == "\n":
-            return
-        if c == "/" and self._peek() == "/":  # line comment
-            while self._peek() != "\n" and not self._is_at_end():
-                self._advance()
-            return
-        if c == "/" and self._peek() == "*":  # block comment /* ... */
-            self._advance()  # consume '*'
-            self._block_comment()
-            return
-
-        # single-char tokens
-        single = {
-            "(": "LEFT_PAREN",
-            ")": "RIGHT_PAREN",
-            "{": "LEFT_BRACE",
-            "}": "RIGHT_BRACE",
-            ",": "COMMA",
-            ";": "SEMICOLON",
-        }
-        if c in single:
-            self._add(single[c])
-            return
-
-        # one or two char operators
-        if c == "!":
-            self._add("BANG_EQUAL" if self._match("=") else "BANG")
-            return
-        if c == "=":
-            self._add("EQUAL_EQUAL" if self._match("=") else "EQUAL")
-            return
-        if c == "<":
-            self._add("LESS_EQUAL" if self._match("=") else "LESS")
-            return
-        if c == ">":
-            self._add("GREATER_EQUAL" if self._match("=") else "GREATER")
-            return
-        if c == "+":
-            self._add("PLUS")
-            return
-        if c == "-":
-            self._add("MINUS")
-            return
-        if c == "*":
-            self._add("STAR")
-            return
-        if c == "/":
-            self._add("SLASH")
-            return
-        if c == "%":
-            self._add("PERCENT")
-            return
-        if c == "\"":
-            self._string()
-            return
-
-        if c.isdigit():
-            self._number()
-            return
-        if c.isalpha() or c == "_":
-            self._identifier()
-            return
-
-        raise SyntaxError(f"Unexpected character {c!r} at line {self.line}")
-
-    def _block_comment(self):
+    def _newlines(self, text: str, start: int):
+        count = text.count("\n")
+        if count:
+            self.line += count
+            self.line_start = start + text.rindex("\n") + 1
+
+    def _block_comment(self, pos: int) -> int:
+        """Skip a (possibly nested) block comment whose opening ``/*`` ends at ``pos``."""
         depth = 1
-        while depth > 0 and not self._is_at_end():
-            ch = self._advance()
-            if ch == "/" and self._peek() == "*":
-                self._advance()
-                depth += 1
-            elif ch == "*" and self._peek() == "/":
-                self._advance()
-                depth -= 1
-        if depth != 0:
-            raise SyntaxError(f"Unterminated block comment at line {self.line}")
-
-    def _string(self):
-        start_line = self.line
-        value_chars: List[str] = []
-        while not self._is_at_end():
-            ch = self._advance()
-            if ch == "\"":
-                break
-            if ch == "\\":
-                nxt = self._advance()
-                escapes = {"n": "\n", "t": "\t", "r": "\r", '"': '"', "\\": "\\"}
-                value_chars.append(escapes.get(nxt, nxt))
-            else:
-                value_chars.append(ch)
-        else:
-            raise SyntaxError(f"Unterminated string starting at line {start_line}")
-        self._add("STRING", "".join(value_chars))
-
-    def _number(self):
-        while self._peek().isdigit():
-            self._advance()
-        if self._peek() == "." and self._peek_next().isdigit():
-            self._advance()
-            while self._peek().isdigit():
-                self._advance()
-        num = float(self.source[self.start:self.current])
-        if num.is_integer():
-            num = int(num)
-        self._add("NUMBER", num)
-
-    def _identifier(self):
-        while (self._peek().isalnum()) or self._peek() == "_":
-            self._advance()
-        text = self.source[self.start:self.current]
-        type_ = KEYWORDS.get(text, "IDENTIFIER")
-        lit = None
-        if type_ == "TRUE":
-            lit = True
-        elif type_ == "FALSE":
-            lit = False
-        elif type_ == "NIL":
-            lit = None
-        self.tokens.append(Token(type_, text, lit, self.line, self.col - len(text)))
+        for m in COMMENT_DELIM_RE.finditer(self.source, pos):
+            depth += 1 if m.group() == "/*" else -1
+            if depth == 0:
+                self._newlines(self.source[pos:m.end()], pos)
+                return m.end()
+        self._newlines(self.source[pos:], pos)
+        raise SyntaxError(f"Unterminated block comment at line {self.line}")
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import List, Optional
+from typing import Any, List, Optional
 from .lexer import Token
 from . import ast_nodes as A
 
@@ -8,6 +8,79 @@ class ParseError(SyntaxError):
     pass
 
 
+# operators folded at parse time when both operands are number literals
+_NUMERIC_FOLDS = {op: fn for op, fn in A.BINARY_OPERATORS.items() if op not in A.EQUALITY_OPERATORS}
+_EQUALITY_FOLDS = {op: fn for op, fn in A.BINARY_OPERATORS.items() if op in A.EQUALITY_OPERATORS}
+_NOTHING = object()
+
+# binding power of each infix operator; all of them are left-associative
+_PRECEDENCE = {
+    "OR": 1,
+    "AND": 2,
+    "BANG_EQUAL": 3,
+    "EQUAL_EQUAL": 3,
+    "GREATER": 4,
+    "GREATER_EQUAL": 4,
+    "LESS": 4,
+    "LESS_EQUAL": 4,
+    "PLUS": 5,
+    "MINUS": 5,
+    "STAR": 6,
+    "SLASH": 6,
+    "PERCENT": 6,
+}
+_LOGICAL_PRECEDENCE = 2  # at or below this operators build Logical nodes
+_LITERAL_TOKENS = frozenset(("NUMBER", "STRING", "TRUE", "FALSE", "NIL"))
+
+
+def _literal_value(expr: A.Expr) -> Any:
+    while isinstance(expr, A.Grouping):
+        expr = expr.expr
+    if isinstance(expr, A.Literal):
+        return expr.value
+    return _NOTHING
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float))
+
+
+def _fold(expr: A.Expr) -> A.Expr:
+    """Collapse an operator over literal operands into a single Literal.
+
+    Only folds what cannot fail at runtime: operations whose operand checks
+    would raise (and arithmetic errors such as division by zero or float
+    overflow) are left for the interpreter so the error still surfaces
+    when, and only if, the code runs.
+    """
+    if isinstance(expr, A.Binary):
+        left = _literal_value(expr.left)
+        right = _literal_value(expr.right)
+        if left is _NOTHING or right is _NOTHING:
+            return expr
+        if expr.op in _EQUALITY_FOLDS:
+            value = _EQUALITY_FOLDS[expr.op](left, right)
+        elif expr.op == "PLUS" and isinstance(left, str) and isinstance(right, str):
+            value = left + right
+        elif expr.op in _NUMERIC_FOLDS and _is_number(left) and _is_number(right):
+            try:
+                value = _NUMERIC_FOLDS[expr.op](left, right)
+            except ArithmeticError:  # division by zero, float overflow
+                return expr
+        else:
+            return expr
+        return A.Literal(value=value, line=expr.line)
+    if isinstance(expr, A.Unary):
+        right = _literal_value(expr.right)
+        if right is _NOTHING:
+            return expr
+        if expr.op == "BANG":
+            return A.Literal(value=not right, line=expr.line)
+        if expr.op == "MINUS" and _is_number(right):
+            return A.Literal(value=-right, line=expr.line)
+    return expr
+
+
 class Parser:
     def __init__(self, tokens: List[Token]):
         self.tokens = tokens
@@ -86,81 +159,45 @@ class Parser:
         self._consume("RIGHT_BRACE", "Expect '}' after block.")
         return statements
 
-    # expressions: logical or -> logical and -> equality -> comparison -> term -> factor -> unary -> primary
-    def _expression(self) -> A.Expr:
-        return self._or()
-
-    def _or(self) -> A.Expr:
-        expr = self._and()
-        while self._match("OR"):
-            op = self._previous().lexeme
-            right = self._and()
-            expr = A.Logical(left=expr, op=op, right=right, line=expr.line)
-        return expr
-
-    def _and(self) -> A.Expr:
-        expr = self._equality()
-        while self._match("AND"):
-            op = self._previous().lexeme
-            right = self._equality()
-            expr = A.Logical(left=expr, op=op, right=right, line=expr.line)
-        return expr
-
-    def _equality(self) -> A.Expr:
-        expr = self._comparison()
-        while self._match("BANG_EQUAL", "EQUAL_EQUAL"):
-            op = self._previous().type
-            right = self._comparison()
-            expr = A.Binary(left=expr, op=op, right=right, line=expr.line)
-        return expr
-
-    def _comparison(self) -> A.Expr:
-        expr = self._term()
-        while self._match("GREATER", "GREATER_EQUAL", "LESS", "LESS_EQUAL"):
-            op = self._previous().type
-            right = self._term()
-            expr = A.Binary(left=expr, op=op, right=right, line=expr.line)
-        return expr
-
-    def _term(self) -> A.Expr:
-        expr = self._factor()
-        while self._match("PLUS", "MINUS"):
-            op = self._previous().type
-            right = self._factor()
-            expr = A.Binary(left=expr, op=op, right=right, line=expr.line)
-        return expr
-
-    def _factor(self) -> A.Expr:
+    # expressions: a precedence-climbing (Pratt) loop over the infix
+    # operators in _PRECEDENCE, then unary -> primary
+    def _expression(self, min_precedence: int = 1) -> A.Expr:
         expr = self._unary()
-        while self._match("STAR", "SLASH", "PERCENT"):
-            op = self._previous().type
-            right = self._unary()
-            expr = A.Binary(left=expr, op=op, right=right, line=expr.line)
-        return expr
+        tokens = self.tokens
+        while True:
+            tok = tokens[self.current]
+            precedence = _PRECEDENCE.get(tok.type, 0)
+            if precedence < min_precedence:
+                return expr
+            self.current += 1
+            right = self._expression(precedence + 1)
+            if precedence <= _LOGICAL_PRECEDENCE:
+                expr = A.Logical(left=expr, op=tok.lexeme, right=right, line=expr.line)
+            else:
+                expr = _fold(A.Binary(left=expr, op=tok.type, right=right, line=expr.line))
 
     def _unary(self) -> A.Expr:
-        if self._match("BANG", "MINUS"):
-            op = self._previous().type
+        op = self.tokens[self.current].type
+        if op == "BANG" or op == "MINUS":
+            self.current += 1
             right = self._unary()
-            return A.Unary(op=op, right=right, line=right.line)
+            return _fold(A.Unary(op=op, right=right, line=right.line))
         return self._primary()
 
     def _primary(self) -> A.Expr:
-        if self._match("NUMBER"):
-            tok = self._previous()
-            return A.Literal(value=tok.literal, line=tok.line)
-        if self._match("STRING"):
-            tok = self._previous()
-            return A.Literal(value=tok.literal, line=tok.line)
-        if self._match("TRUE", "FALSE", "NIL"):
-            tok = self._previous()
+        tok = self.tokens[self.current]
+        if tok.type in _LITERAL_TOKENS:
+            self.current += 1
             return A.Literal(value=tok.literal, line=tok.line)
-        if self._match("IDENTIFIER"):
-            tok = self._previous()
+        if tok.type == "IDENTIFIER":
+            self.current += 1
             return A.Var(name=tok.lexeme, line=tok.line)
         if self._match("LEFT_PAREN"):
             expr = self._expression()
             paren = self._consume("RIGHT_PAREN", "Expect ')' after expression.")
+            if isinstance(expr, A.Literal):
+                # nothing left to group once folded; keep the group's line
+                return A.Literal(value=expr.value, line=paren.line)
             return A.Grouping(expr=expr, line=paren.line)
         raise ParseError(f"Expect expression at line {self._peek().line}")
 
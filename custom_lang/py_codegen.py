@@ -0,0 +1,153 @@
+from __future__ import annotations
+import ast
+from types import CodeType
+from typing import Iterable, List, Set
+from . import ast_nodes as A
+from .resolver import resolve
+
+
+# Runtime helpers the generated code calls; the interpreter supplies them
+# in the namespace it executes the module in.
+PROGRAM = "__program__"
+PRINT = "__print"
+NUM = "__num"
+UNDEFINED = "__undefined"
+BINOP_PREFIX = "__binop_"
+GLOBAL_PREFIX = "g_"
+
+
+def global_name(name: str) -> str:
+    return GLOBAL_PREFIX + name
+
+
+def _loc(line: int):
+    # source lines carry over so Python tracebacks point into the program
+    return {"lineno": line, "end_lineno": line, "col_offset": 0, "end_col_offset": 0}
+
+
+class PyCodegen:
+    """Translates a resolved ``A.Program`` into a CPython ``ast.Module``.
+
+    The program body becomes a single function, so block-scoped variables
+    are plain Python locals (one per frame index, as in the bytecode
+    compiler) and language globals are module globals with a ``g_`` prefix.
+    Globals can only be declared by top-level statements, which run in
+    order, so whether a global exists at a given reference is known here;
+    references to ones that cannot exist compile to a call that raises.
+    """
+
+    def __init__(self, defined_globals: Iterable[str] = ()):
+        self._defined: Set[str] = set(defined_globals)
+        self._assigned: Set[str] = set()
+        self._bases: List[int] = []
+        self._frame_end = 0
+
+    def generate(self, program: A.Program) -> ast.Module:
+        resolve(program)
+        body = self._stmts(program.statements)
+        if self._assigned:
+            body.insert(0, ast.Global(names=sorted(self._assigned)))
+        module = ast.parse(f"def {PROGRAM}():\n    pass\n")
+        module.body[0].body = body or [ast.Pass()]
+        return ast.fix_missing_locations(module)
+
+    # naming
+    def _local(self, name: str, depth: int, slot: int) -> str:
+        return f"l{self._bases[-1 - depth] + slot}_{name}"
+
+    # statements
+    def _stmts(self, statements: List[A.Stmt]) -> List[ast.stmt]:
+        out: List[ast.stmt] = []
+        for stmt in statements:
+            out.extend(self._stmt(stmt))
+        return out
+
+    def _stmt(self, stmt: A.Stmt) -> List[ast.stmt]:
+        loc = _loc(stmt.line)
+        if isinstance(stmt, A.Block):
+            if stmt.names:
+                self._bases.append(self._frame_end)
+                self._frame_end += len(stmt.names)
+            body = self._stmts(stmt.statements)
+            if stmt.names:
+                self._frame_end = self._bases.pop()
+            return body
+        if isinstance(stmt, A.VarDecl):
+            value = self._expr(stmt.initializer) if stmt.initializer is not None else ast.Constant(None, **loc)
+            if stmt.slot < 0:
+                self._defined.add(stmt.name)
+                self._assigned.add(global_name(stmt.name))
+                target = global_name(stmt.name)
+            else:
+                target = self._local(stmt.name, 0, stmt.slot)
+            return [ast.Assign(targets=[ast.Name(target, ast.Store(), **loc)], value=value, **loc)]
+        if isinstance(stmt, A.Assign):
+            value = self._expr(stmt.value)
+            if stmt.depth >= 0:
+                target = self._local(stmt.name, stmt.depth, stmt.slot)
+            elif stmt.name in self._defined:
+                target = global_name(stmt.name)
+                self._assigned.add(target)
+            else:
+                # evaluate the value first, as the other engines do
+                return [ast.Expr(value, **loc), ast.Expr(self._undefined(stmt.name, loc), **loc)]
+            return [ast.Assign(targets=[ast.Name(target, ast.Store(), **loc)], value=value, **loc)]
+        if isinstance(stmt, A.ExprStmt):
+            return [ast.Expr(self._expr(stmt.expr), **loc)]
+        if isinstance(stmt, A.Print):
+            return [ast.Expr(self._call(PRINT, [self._expr(stmt.expr)], loc), **loc)]
+        if isinstance(stmt, A.If):
+            orelse = self._stmt(stmt.else_branch) if stmt.else_branch is not None else []
+            return [ast.If(self._expr(stmt.condition), self._stmt(stmt.then_branch) or [ast.Pass(**loc)], orelse, **loc)]
+        if isinstance(stmt, A.While):
+            return [ast.While(self._expr(stmt.condition), self._stmt(stmt.body) or [ast.Pass(**loc)], [], **loc)]
+        if isinstance(stmt, A.Break):
+            return [ast.Break(**loc)]
+        if isinstance(stmt, A.Continue):
+            return [ast.Continue(**loc)]
+        raise RuntimeError(f"Unknown statement type: {type(stmt)}")
+
+    # expressions
+    def _expr(self, expr: A.Expr) -> ast.expr:
+        loc = _loc(expr.line)
+        if isinstance(expr, A.Literal):
+            return ast.Constant(expr.value, **loc)
+        if isinstance(expr, A.Var):
+            if expr.depth >= 0:
+                return ast.Name(self._local(expr.name, expr.depth, expr.slot), ast.Load(), **loc)
+            if expr.name in self._defined:
+                return ast.Name(global_name(expr.name), ast.Load(), **loc)
+            return self._undefined(expr.name, loc)
+        if isinstance(expr, A.Grouping):
+            return self._expr(expr.expr)
+        if isinstance(expr, A.Unary):
+            right = self._expr(expr.right)
+            if expr.op == "BANG":
+                return ast.UnaryOp(ast.Not(), right, **loc)
+            if expr.op == "MINUS":
+                return ast.UnaryOp(ast.USub(), self._call(NUM, [right, ast.Constant(expr.line)], loc), **loc)
+            raise RuntimeError(f"Unknown unary op {expr.op}")
+        if isinstance(expr, A.Binary):
+            left = self._expr(expr.left)
+            right = self._expr(expr.right)
+            if expr.op == "EQUAL_EQUAL":
+                return ast.Compare(left, [ast.Eq()], [right], **loc)
+            if expr.op == "BANG_EQUAL":
+                return ast.Compare(left, [ast.NotEq()], [right], **loc)
+            # everything else checks its operands at runtime
+            return self._call(BINOP_PREFIX + expr.op, [left, right, ast.Constant(expr.line)], loc)
+        if isinstance(expr, A.Logical):
+            op = ast.Or() if expr.op == "or" else ast.And()
+            return ast.BoolOp(op, [self._expr(expr.left), self._expr(expr.right)], **loc)
+        raise RuntimeError(f"Unknown expression type: {type(expr)}")
+
+    def _call(self, func: str, args: List[ast.expr], loc) -> ast.Call:
+        return ast.Call(ast.Name(func, ast.Load(), **loc), args, [], **loc)
+
+    def _undefined(self, name: str, loc) -> ast.Call:
+        return self._call(UNDEFINED, [ast.Constant(name)], loc)
+
+
+def compile_python(program: A.Program, defined_globals: Iterable[str] = ()) -> CodeType:
+    module = PyCodegen(defined_globals).generate(program)
+    return compile(module, "<custom>", "exec")
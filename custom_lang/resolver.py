@@ -0,0 +1,90 @@
+from __future__ import annotations
+import sys
+from typing import Dict, List
+from . import ast_nodes as A
+
+
+class Resolver:
+    """Binds block-scoped variables to (depth, slot) pairs ahead of execution.
+
+    Every block that declares something gets a scope whose variables are
+    numbered in declaration order. A reference records how many such scopes
+    out its declaration lives and its slot there. Names not declared in any
+    enclosing block keep depth -1 and are looked up in the globals by name.
+    """
+
+    def __init__(self):
+        self._scopes: List[Dict[str, int]] = []
+        self._loop_depth = 0
+
+    def resolve(self, program: A.Program) -> A.Program:
+        for stmt in program.statements:
+            self._stmt(stmt)
+        return program
+
+    def _stmt(self, stmt: A.Stmt):
+        if isinstance(stmt, A.Block):
+            scoped = any(isinstance(s, A.VarDecl) for s in stmt.statements)
+            if scoped:
+                self._scopes.append({})
+            for s in stmt.statements:
+                self._stmt(s)
+            stmt.names = list(self._scopes.pop()) if scoped else []
+        elif isinstance(stmt, A.VarDecl):
+            # the initializer still sees any outer binding of the same name
+            if stmt.initializer is not None:
+                self._expr(stmt.initializer)
+            stmt.name = sys.intern(stmt.name)
+            if self._scopes:
+                scope = self._scopes[-1]
+                stmt.slot = scope.setdefault(stmt.name, len(scope))
+            else:
+                stmt.slot = -1
+        elif isinstance(stmt, A.Assign):
+            self._expr(stmt.value)
+            stmt.name = sys.intern(stmt.name)
+            stmt.depth, stmt.slot = self._lookup(stmt.name)
+        elif isinstance(stmt, (A.ExprStmt, A.Print)):
+            self._expr(stmt.expr)
+        elif isinstance(stmt, A.If):
+            self._expr(stmt.condition)
+            self._stmt(stmt.then_branch)
+            if stmt.else_branch is not None:
+                self._stmt(stmt.else_branch)
+        elif isinstance(stmt, A.While):
+            self._expr(stmt.condition)
+            self._loop_depth += 1
+            self._stmt(stmt.body)
+            self._loop_depth -= 1
+        elif isinstance(stmt, (A.Break, A.Continue)):
+            if not self._loop_depth:
+                keyword = "break" if isinstance(stmt, A.Break) else "continue"
+                raise SyntaxError(f"'{keyword}' outside of loop at line {stmt.line}")
+        else:
+            raise RuntimeError(f"Unknown statement type: {type(stmt)}")
+
+    def _expr(self, expr: A.Expr):
+        if isinstance(expr, A.Var):
+            # lexer names are interned already; hand-built trees may not be
+            expr.name = sys.intern(expr.name)
+            expr.depth, expr.slot = self._lookup(expr.name)
+        elif isinstance(expr, A.Grouping):
+            self._expr(expr.expr)
+        elif isinstance(expr, A.Unary):
+            self._expr(expr.right)
+        elif isinstance(expr, (A.Binary, A.Logical)):
+            self._expr(expr.left)
+            self._expr(expr.right)
+        elif not isinstance(expr, A.Literal):
+            raise RuntimeError(f"Unknown expression type: {type(expr)}")
+
+    def _lookup(self, name: str):
+        for depth, scope in enumerate(reversed(self._scopes)):
+            slot = scope.get(name)
+            if slot is not None:
+                return depth, slot
+        return -1, -1
+
+
+def resolve(program: A.Program) -> A.Program:
+    return Resolver().resolve(program)